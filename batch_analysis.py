@@ -0,0 +1,46 @@
+"""
+batch_analysis.py
+
+A script for reporting income data across every channel's log in a directory. Logs are parsed in segments and charts
+are rendered across a pool of processes, with a chart saved for each channel and one for all channels combined.
+"""
+
+import argparse
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bot import analysis
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Render income charts for every bot-<channel>.log in a directory.')
+    parser.add_argument('directory', metavar='DIRECTORY', help='The directory containing the log files.')
+    parser.add_argument('--output', default='charts', help='The directory to save charts to.')
+    parser.add_argument('--workers', type=int, default=None, help='The number of processes to use.')
+    parser.add_argument('--segment-size', type=int, default=16 * 1024 * 1024,
+                        help='The size in bytes of the segments large logs are split into.')
+
+    parsed = parser.parse_args()
+    os.makedirs(parsed.output, exist_ok=True)
+    logs = analysis.find_logs(parsed.directory)
+
+    with ProcessPoolExecutor(parsed.workers) as executor:
+        # Segments are submitted in order, so each channel's events can be joined back together as they were logged.
+        futures = {channel: [executor.submit(analysis.parse_segment, path, start, end)
+                             for start, end in analysis.segments(path, parsed.segment_size)]
+                   for channel, path in logs.items()}
+        events = {channel: [event for future in segment_futures for event in future.result()]
+                  for channel, segment_futures in futures.items()}
+        combined = list(heapq.merge(*events.values()))
+
+        charts = {channel: executor.submit(analysis.render, f'Earnings by Task over time in {channel}', channel_events,
+                                           os.path.join(parsed.output, f'{channel}.png'))
+                  for channel, channel_events in events.items()}
+        charts['combined'] = executor.submit(analysis.render, 'Earnings by Task over time', combined,
+                                             os.path.join(parsed.output, 'combined.png'))
+
+        for channel, chart in charts.items():
+            earnings = ', '.join(f'{k} {v}' for k, v in chart.result().items())
+            print(f'{channel}: {earnings}.')
+
+    print(f'Saved {len(charts)} charts to {parsed.output}.')
@@ -0,0 +1,39 @@
+"""
+blackjack_report.py
+
+A script for comparing the realized results of recorded Blackjack hands against the expected value of each decision.
+Cells listed first are the least likely to be explained by chance, and point towards strategy or parser bugs.
+"""
+
+import argparse
+import math
+import os
+
+from bot import constants
+from bot.history import HandHistory
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Report realized vs. expected value of recorded Blackjack hands.')
+    parser.add_argument('history', metavar='HISTORY', nargs='?', default=constants.HAND_HISTORY,
+                        help='The hand history file to read.')
+    parser.add_argument('--min-hands', type=int, default=30, help='Hide cells with fewer hands than this.')
+    parser.add_argument('--top', type=int, default=25, help='The number of cells to show.')
+
+    parsed = parser.parse_args()
+    if not os.path.exists(parsed.history):
+        parser.exit(1, f'No hand history found at {parsed.history}, play some Blackjack first.\n')
+
+    reports, excluded = HandHistory(parsed.history).report(parsed.min_hands)
+    unmodelled = [report for report in reports if math.isnan(report.z)]
+    reports = [report for report in reports if not math.isnan(report.z)]
+
+    print(f'{"Cell":<16} {"Choice":<6} {"Hands":>8} {"Realized":>9} {"Expected":>9} {"Z":>7}')
+    for report in reports[:parsed.top]:
+        cell = f'{report.table} {report.row} v {report.column}'
+        print(f'{cell:<16} {report.choice:<6} {report.hands:>8} {report.realized:>9.3f} {report.expected:>9.3f} '
+              f'{report.z:>7.2f}')
+    print(f'{len(reports)} cells with at least {parsed.min_hands} hands.')
+    if unmodelled:
+        cells = ', '.join(f'{r.table} {r.row} v {r.column} {r.choice} ({r.hands})' for r in unmodelled[:5])
+        print(f'{len(unmodelled)} cells without an expected value, e.g. splitting a non-pair: {cells}')
+    print(f'{excluded} hands excluded for an unknown bet, no recorded choice or a malformed line.')
@@ -0,0 +1,102 @@
+"""
+analysis.py
+
+Holds functions for parsing income data out of the bot's log files and rendering it to charts without a display.
+Everything here is picklable so that it can be spread across a process pool.
+"""
+
+import os
+import re
+from itertools import accumulate
+from typing import List, Tuple, Dict
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+TASKS = ['work', 'slut', 'crime']
+LOG_REGEX = re.compile(r'^bot-(\d+)\.log$')
+EXECUTING_REGEX = re.compile(r'^\[([0-9-:, ]+)\] \[\w+\] \[\w+\] Executing \$(work|crime|slut) task\.')
+CHANGE_REGEX = re.compile(r'^\[[0-9-:, ]+\] \[INFO\] \[\w+\] (?:.* )?(Gained|Lost) \$-?([0-9,]+)')
+
+# A single task's outcome: the timestamp it was executed at, the task and the change in money.
+Event = Tuple[str, str, int]
+
+
+def find_logs(directory: str) -> Dict[str, str]:
+    """Returns the path of every channel log in the directory, keyed by the channel ID."""
+    logs = {}
+    for filename in sorted(os.listdir(directory)):
+        match = LOG_REGEX.match(filename)
+        if match:
+            logs[match.group(1)] = os.path.join(directory, filename)
+    return logs
+
+
+def segments(path: str, size: int) -> List[Tuple[int, int]]:
+    """Splits a file into byte ranges of roughly the given size. Ranges are aligned to lines by parse_segment."""
+    length = os.path.getsize(path)
+    return [(start, min(start + size, length)) for start in range(0, length, size)] or [(0, 0)]
+
+
+def parse_segment(path: str, start: int, end: int) -> List[Event]:
+    """
+    Parse the task outcomes in a byte range of a log file.
+
+    A task belongs to the segment its 'Executing' line starts in, and must be followed directly by the line logging
+    the money gained or lost - the following line is read even if it lies past the end of the segment.
+    """
+    events = []
+    with open(path, 'rb') as file:
+        # Skip the line straddling the start, unless the range begins exactly at the start of a line.
+        if start > 0:
+            file.seek(start - 1)
+            file.readline()
+
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+
+            executing = EXECUTING_REGEX.match(line.decode('utf-8', errors='replace'))
+            if executing is None:
+                continue
+
+            position = file.tell()
+            change = CHANGE_REGEX.match(file.readline().decode('utf-8', errors='replace'))
+            if change is None:
+                file.seek(position)
+                continue
+
+            value = int(change.group(2).replace(',', ''))
+            events.append((executing.group(1), executing.group(2), -value if change.group(1) == 'Lost' else value))
+    return events
+
+
+def cumulative(events: List[Event]) -> Dict[str, List[int]]:
+    """Builds the running earnings of each task, plus the total, after every task executed."""
+    changes = {task: [0] + [change if event_task == task else 0 for _, event_task, change in events] for task in TASKS}
+    changes['total'] = [0] + [change for _, _, change in events]
+    return {task: list(accumulate(values)) for task, values in changes.items()}
+
+
+def render(title: str, events: List[Event], path: str) -> Dict[str, int]:
+    """
+    Renders the earnings over time to an image file.
+    :return: The final earnings of each task and the total.
+    """
+    changes = cumulative(events)
+
+    fig, ax = plt.subplots()
+    xaxis = list(range(len(changes['total'])))
+    for k, v in changes.items():
+        ax.plot(xaxis, v, label=k)
+    ax.legend(loc='upper left')
+    ax.set_title(title)
+    ax.set_xlabel('Tasks')
+    ax.set_ylabel('Earnings ($)')
+    fig.savefig(path)
+    plt.close(fig)
+
+    return {task: values[-1] for task, values in changes.items()}
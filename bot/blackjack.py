@@ -7,7 +7,8 @@ related to Blackjack.
 import logging
 import os
 import re
-from typing import Tuple, List, Dict
+from functools import lru_cache
+from typing import Tuple, List, Dict, Optional
 
 import discord
 
@@ -76,7 +77,7 @@ class Card(object):
     def table(self) -> str:
         """Gets the table key representation of this card. Dealer column, or (partial) Player Soft/Pair rows only."""
         if self.isAce(): return 'A'
-        if self.isFace(): return 'T'
+        if self.isFace() or self.symbol == '10': return 'T'
         if self.isNumerical(): return self.symbol
         return '?'
 
@@ -144,44 +145,50 @@ class Blackjack(object):
     HARD, SOFT, PAIR = 0, 1, 2
 
     @staticmethod
-    def choose(options: constants.PlayOptions, cards: List[Card], dealer: Card) -> str:
-        """With all information presented, calculates the final decision."""
-
-        choice: str = 'S'  # Default is to stand
-        usedDefault = True
+    def classify(cards: List[Card], dealer: Card) -> Optional[Tuple[int, str, str]]:
+        """
+        Finds the table and keys describing the decision cell for a hand.
 
+        :return: A tuple of the table, row key and column key, or None if the hand is not covered by any table.
+        """
         # Pair checking first
         if len(cards) == 2 and cards[0] == cards[1]:
-            symbol = {cards[0].table}
+            symbol = cards[0].table
             logger.debug(f'Pair of {cards[0]} found.')
-            choice = Blackjack.access(Blackjack.PAIR, (f'{symbol}-{symbol}', dealer.table))
-            usedDefault = False
+            return Blackjack.PAIR, f'{symbol}-{symbol}', dealer.table
         elif any(card.isAce() for card in cards):
             sum_value = sum(card.value for card in cards if not card.isAce())
             if 2 <= sum_value <= 9:
-                choice = Blackjack.access(Blackjack.SOFT, (f'A-{sum_value}', dealer.table))
-                usedDefault = False
-            else:
-                cards = ", ".join(card.symbol.upper() for card in cards)
-                logger.error(f'Sum of cards was a Soft {sum_value} ({cards})')
+                return Blackjack.SOFT, f'A-{sum_value}', dealer.table
+            cards = ", ".join(card.symbol.upper() for card in cards)
+            logger.error(f'Sum of cards was a Soft {sum_value} ({cards})')
         else:
             sum_value = sum(card.value for card in cards)
             if 5 <= sum_value <= 20:
-                choice = Blackjack.access(Blackjack.HARD, (str(sum_value), dealer.table))
-                usedDefault = False
-            else:
-                cards = ", ".join(card.symbol.upper() for card in cards)
-                logger.error(f'Sum of cards was a Soft {sum_value} ({cards})')
+                return Blackjack.HARD, str(sum_value), dealer.table
+            cards = ", ".join(card.symbol.upper() for card in cards)
+            logger.error(f'Sum of cards was a Hard {sum_value} ({cards})')
+        return None
 
-        if usedDefault:
+    @staticmethod
+    def choose(options: constants.PlayOptions, cards: List[Card], dealer: Card) -> str:
+        """With all information presented, calculates the final decision."""
+        cell = Blackjack.classify(cards, dealer)
+        if cell is None:
             logger.warning('No tables were accessed to make a choice. Defaulting to stand.')
-        return Blackjack.convert_letter(choice)
+            return Blackjack.convert_letter('S')
+        return Blackjack.convert_letter(Blackjack.access(cell[0], cell[1:]))
 
     @classmethod
     def convert_letter(cls, letter: str) -> str:
         """Simple class method for returning the player response to the bot based on the letter given."""
         return Blackjack.__letter_meanings[letter]
 
+    @classmethod
+    def convert_word(cls, word: str) -> str:
+        """Inverse of convert_letter, returning the table letter for a player response."""
+        return next(letter for letter, meaning in Blackjack.__letter_meanings.items() if meaning == word)
+
     def options_convert(self, choice: str, options: constants.PlayOptions) -> str:
         """Converts the choice to the best possible choice based on the options given by the bot."""
 
@@ -221,3 +228,100 @@ class Blackjack(object):
         if table == cls.HARD: return cls.__hard_data[key]
         if table == cls.SOFT: return cls.__soft_data[key]
         if table == cls.PAIR: return cls.__pair_data[key]
+
+
+# Probability of drawing each card value (aces as 1) from an infinite deck.
+_CARD_PROBABILITIES = tuple((value, (4 if value == 10 else 1) / 13) for value in range(1, 11))
+
+
+def _add_card(total: int, soft: bool, value: int) -> Tuple[int, bool]:
+    """Adds a card value to a hand total, tracking whether an ace is currently counted as 11."""
+    total += value
+    if value == 1 and total + 10 <= 21:
+        total, soft = total + 10, True
+    if total > 21 and soft:
+        total, soft = total - 10, False
+    return total, soft
+
+
+def _card_value(card: Card) -> int:
+    """Returns the card's value with aces counted as 1."""
+    return 1 if card.isAce() else card.value
+
+
+@lru_cache(maxsize=None)
+def dealer_outcomes(total: int, soft: bool) -> Tuple[Tuple[int, float], ...]:
+    """
+    Calculates the distribution of the dealer's final total, with 22 standing in for any bust.
+    The dealer draws to 17 and stands on all 17s.
+    """
+    if total >= 17:
+        return (min(total, 22), 1.0),
+
+    distribution = {}
+    for value, probability in _CARD_PROBABILITIES:
+        for final, chance in dealer_outcomes(*_add_card(total, soft, value)):
+            distribution[final] = distribution.get(final, 0.0) + probability * chance
+    return tuple(sorted(distribution.items()))
+
+
+@lru_cache(maxsize=None)
+def _stand(total: int, up: int) -> float:
+    if total > 21:
+        return -1.0
+    expected = 0.0
+    for final, chance in dealer_outcomes(*_add_card(0, False, up)):
+        if final > 21 or final < total:
+            expected += chance
+        elif final > total:
+            expected -= chance
+    return expected
+
+
+@lru_cache(maxsize=None)
+def _hit(total: int, soft: bool, up: int) -> float:
+    return sum(probability * _best(*_add_card(total, soft, value), up) for value, probability in _CARD_PROBABILITIES)
+
+
+@lru_cache(maxsize=None)
+def _double(total: int, soft: bool, up: int) -> float:
+    return 2 * sum(probability * _stand(_add_card(total, soft, value)[0], up)
+                   for value, probability in _CARD_PROBABILITIES)
+
+
+@lru_cache(maxsize=None)
+def _best(total: int, soft: bool, up: int, can_double: bool = False) -> float:
+    if total > 21:
+        return -1.0
+    best = max(_stand(total, up), _hit(total, soft, up))
+    return max(best, _double(total, soft, up)) if can_double else best
+
+
+@lru_cache(maxsize=None)
+def _split(value: int, up: int) -> float:
+    # Each hand receives one more card; split aces must stand, other hands play on without resplitting.
+    start = _add_card(0, False, value)
+    if value == 1:
+        hand = sum(probability * _stand(_add_card(*start, card)[0], up) for card, probability in _CARD_PROBABILITIES)
+    else:
+        hand = sum(probability * _best(*_add_card(*start, card), up, True) for card, probability in _CARD_PROBABILITIES)
+    return 2 * hand
+
+
+def expected_value(cards: List[Card], dealer: Card, letter: str) -> float:
+    """
+    Calculates the expected return, in units of the initial bet, of making a decision with the given hand.
+
+    Uses an infinite deck where the dealer stands on all 17s and does not peek for blackjack. Any decisions after
+    the given one are assumed to be played optimally. Splitting a non-pair returns NaN.
+    """
+    total, soft = 0, False
+    for card in cards:
+        total, soft = _add_card(total, soft, _card_value(card))
+    up = _card_value(dealer)
+
+    if letter == 'S': return _stand(total, up)
+    if letter == 'H': return _hit(total, soft, up)
+    if letter == 'D': return _double(total, soft, up)
+    if letter == 'P' and len(cards) == 2 and cards[0] == cards[1]: return _split(_card_value(cards[0]), up)
+    return float('nan')
@@ -6,12 +6,15 @@ Stores the primary client class, which accesses the Discord API and processes me
 
 import ctypes
 import logging
-from typing import Optional
+import os
+import re
+import signal
+from typing import Optional, Tuple, List
 
 import discord
 from discord.ext.tasks import loop
 
-from bot import constants, parsers, timings, helpers
+from bot import constants, parsers, timings, helpers, profiling, history
 from bot.blackjack import Card, Blackjack
 from bot.constants import PlayOptions
 
@@ -20,6 +23,9 @@ logger.setLevel(constants.LOGGING_LEVEL)
 
 
 class UnbelievaClient(discord.Client):
+    BET_REGEX = re.compile(r'^\$(?:bj|blackjack) (\S+)', re.IGNORECASE)
+    ACTION_REGEX = re.compile(r'^(hit|stand|double down|split)$', re.IGNORECASE)
+
     def __init__(self, bot_id: int, channel_id: int, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.last_message = -1
@@ -41,18 +47,39 @@ class UnbelievaClient(discord.Client):
         self.last_user_deposit = -1
 
         self.current_blackjack: Optional[discord.Message] = None
+        self.current_hand: Optional[history.HandRecord] = None
+        self.last_bet = 0
+        self.hand_history = history.HandHistory()
+        self.profiler = profiling.SamplingProfiler()
 
     async def on_ready(self):
         await self.wait_until_ready()
 
         self.channel: discord.TextChannel = self.get_channel(self.channel_id)
         self.check_task_available.start()
+        self.check_profile_trigger.start()
+        if hasattr(signal, 'SIGUSR1'):
+            try:
+                self.loop.add_signal_handler(signal.SIGUSR1, self.profiler.start)
+            except NotImplementedError:
+                logger.debug('Signal handlers are not supported by this event loop, use the trigger file instead.')
         ctypes.windll.kernel32.SetConsoleTitleW(f"#{self.channel.name}/{self.channel.guild.name}")
         logger.info(f'Connected to #{self.channel.name} in {self.channel.guild.name}')
 
     async def on_message(self, message: discord.Message):
-        # Ignore messages in other channels or sent by myself
-        if message.channel != self.channel or message.author == self.user:
+        # Ignore messages in other channels or sent by myself, other than noting the bet and moves of Blackjack games
+        if message.channel != self.channel:
+            return
+        if message.author == self.user:
+            bet_match = re.match(self.BET_REGEX, message.content)
+            if bet_match:
+                # Bets such as 'all' or '1k' can't be known exactly, and are recorded as unknown (0).
+                bet = bet_match.group(1).replace(',', '')
+                self.last_bet = int(bet) if bet.isdigit() else 0
+
+            action_match = re.match(self.ACTION_REGEX, message.content.strip())
+            if action_match and self.current_hand is not None:
+                self.current_hand.decide(action_match.group(1).lower())
             return
 
         if message.author.id == self.bot_id and len(message.embeds) > 0:
@@ -75,12 +102,40 @@ class UnbelievaClient(discord.Client):
 
             # Handling for blackjack
             if embed.description.startswith('Type `hit` to draw another card'):
-                options = self.parse_options(embed.description)
-                my_cards = Card.parse_cards(embed.fields[0])[1]
-                dealer_card = Card.parse_cards(embed.fields[1])[1][0]
+                options, my_cards, dealer_card, choice = self.predict_blackjack(embed)
+
+                if is_self:
+                    self.current_blackjack = message
+                    self.current_hand = history.HandRecord(my_cards, dealer_card, options, self.last_bet)
+                    if self.last_bet == 0:
+                        logger.debug('Recording Blackjack hand with an unknown bet, it will be excluded from reports.')
+                    self.current_hand.predict(choice)
+                    self.last_bet = 0
+
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        # Blackjack games are played out by editing the original message
+        if self.current_blackjack is None or after.id != self.current_blackjack.id or len(after.embeds) == 0:
+            return
 
-                choice = Blackjack.choose(options, my_cards, dealer_card)
-                logger.info(f'Predicted best choice for Blackjack: {choice}')
+        embed = after.embeds[0]
+        if parsers.BlackjackResult.check_valid(after):
+            result = parsers.BlackjackResult(after)
+            self.current_hand.finish(result.result, result.change, Card.parse_cards(embed.fields[0])[1],
+                                     Card.parse_cards(embed.fields[1])[1])
+            self.hand_history.append(self.current_hand)
+            self.current_blackjack, self.current_hand = None, None
+        elif embed.description.startswith('Type `hit` to draw another card'):
+            self.current_hand.predict(self.predict_blackjack(embed)[3])
+
+    def predict_blackjack(self, embed: discord.Embed) -> Tuple[PlayOptions, List[Card], Card, str]:
+        """Parse a Blackjack embed awaiting a decision, returning the options, both hands and the predicted choice."""
+        options = self.parse_options(embed.description)
+        my_cards = Card.parse_cards(embed.fields[0])[1]
+        dealer_card = Card.parse_cards(embed.fields[1])[1][0]
+
+        choice = Blackjack.choose(options, my_cards, dealer_card)
+        logger.info(f'Predicted best choice for Blackjack: {choice}')
+        return options, my_cards, dealer_card, choice
 
     def parse_options(self, options_str: str) -> PlayOptions:
         """
@@ -109,3 +164,25 @@ class UnbelievaClient(discord.Client):
                 # Activate the cooldowns
                 task_cooldown.hit()
                 self.command_cooldown.hit()
+
+    @loop(seconds=5)
+    async def check_profile_trigger(self):
+        """Loop to start the profiler when the trigger file appears. The file may contain a duration in seconds."""
+        if not os.path.exists(constants.PROFILE_TRIGGER):
+            return
+
+        # The file may disappear or be locked by whatever created it, so try again on the next iteration.
+        try:
+            with open(constants.PROFILE_TRIGGER, 'r') as file:
+                contents = file.read().strip()
+            os.remove(constants.PROFILE_TRIGGER)
+        except OSError as e:
+            logger.warning(f'Could not consume the profiling trigger file: {e}')
+            return
+
+        try:
+            duration = float(contents) if contents else constants.PROFILE_DURATION
+        except ValueError:
+            logger.warning(f'Could not parse profiling duration "{contents}", using the default.')
+            duration = constants.PROFILE_DURATION
+        self.profiler.start(duration)
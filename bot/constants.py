@@ -14,9 +14,15 @@ BASE_DIR = os.path.dirname(os.path.abspath(os.path.join(__file__, '..')))
 STATIC_DIR = os.path.join(BASE_DIR, 'bot', 'static')
 TOKEN = os.path.join(BASE_DIR, 'token.dat')
 DATABASE = os.path.join(BASE_DIR, 'database.db')
+HAND_HISTORY = os.path.join(BASE_DIR, 'hands.tsv')
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILE_TRIGGER = os.path.join(BASE_DIR, 'profile.trigger')
 
 # Other constants
 LOGGING_LEVEL = logging.DEBUG
+PROFILE_DURATION = 30.0
+PROFILE_INTERVAL = 0.005
+STALL_THRESHOLD = 0.1
 
 # NamedTuple Classes
 PlayOptions = namedtuple('PlayOptions', ['hit', 'stand', 'double', 'split'])
@@ -0,0 +1,162 @@
+"""
+history.py
+
+Holds the Blackjack hand history recorder and the report comparing realized results against expected value.
+"""
+
+import logging
+import time
+from collections import namedtuple
+from typing import List, Optional, Dict, Tuple
+
+import numpy as np
+
+from bot import constants
+from bot.blackjack import Card, Blackjack, expected_value
+
+logger = logging.getLogger(__file__)
+logger.setLevel(constants.LOGGING_LEVEL)
+
+CellReport = namedtuple('CellReport', ['table', 'row', 'column', 'choice', 'hands', 'realized', 'expected', 'z'])
+
+TABLE_NAMES = {Blackjack.HARD: 'hard', Blackjack.SOFT: 'soft', Blackjack.PAIR: 'pair'}
+
+# Lower bound on the standard deviation of a single hand's return per unit bet, roughly that of a typical hand.
+# Doubling and splitting put twice the bet at risk, and so use twice the floor.
+MIN_HAND_STD = 1.1
+
+
+class HandRecord(object):
+    """
+    A single Blackjack game, from the first decision to the final result.
+
+    Serialized as one tab separated line: timestamp, starting cards, dealer upcard, options, choices played,
+    choices predicted by the strategy tables, final player cards, final dealer cards, result, bet and change in money.
+    """
+
+    def __init__(self, cards: List[Card], dealer: Card, options: constants.PlayOptions, bet: int = 0) -> None:
+        self.timestamp = int(time.time())
+        self.cards, self.dealer, self.options, self.bet = cards, dealer, options, bet
+
+        self.choices, self.predictions = '', ''
+        self.final_cards: List[Card] = []
+        self.final_dealer: List[Card] = []
+        self.result: Optional[str] = None
+        self.change = 0
+
+    def decide(self, choice: str) -> None:
+        """Record the choice played by the user at the next decision point."""
+        self.choices += Blackjack.convert_word(choice)
+
+    def predict(self, choice: str) -> None:
+        """Record the choice predicted at the next decision point, kept for comparison with the choice played."""
+        self.predictions += Blackjack.convert_word(choice)
+
+    def finish(self, result: str, change: int, cards: List[Card], dealer: List[Card]) -> None:
+        """Record the outcome of the game."""
+        self.result, self.change = result, change
+        self.final_cards, self.final_dealer = cards, dealer
+
+    def to_line(self) -> str:
+        options = ''.join('1' if option else '0' for option in self.options)
+        return '\t'.join([str(self.timestamp), ','.join(card.raw_card for card in self.cards), self.dealer.raw_card,
+                          options, self.choices, self.predictions, ','.join(card.raw_card for card in self.final_cards),
+                          ','.join(card.raw_card for card in self.final_dealer), self.result or '', str(self.bet),
+                          str(self.change)]) + '\n'
+
+
+class HandHistory(object):
+    """Append-only store of finished Blackjack games."""
+
+    def __init__(self, path: str = constants.HAND_HISTORY) -> None:
+        self.path = path
+
+    def append(self, record: HandRecord) -> None:
+        """Write a finished game to the end of the history file."""
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(record.to_line())
+        logger.debug(f'Recorded Blackjack hand: {record.choices} -> {record.result} ({record.change})')
+
+    def load(self) -> Tuple[Dict[str, np.ndarray], int]:
+        """
+        Read the columns needed for reporting into arrays.
+
+        :return: The columns, and the number of malformed lines skipped, such as those from an older format or cut
+                 short by a crash while appending.
+        """
+        cards, dealer, choices, bets, changes = [], [], [], [], []
+        malformed = 0
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                parts = line.rstrip('\n').split('\t')
+                try:
+                    if len(parts) != 11:
+                        raise ValueError(f'Expected 11 fields, found {len(parts)}')
+                    bet, change = int(parts[9]), int(parts[10])
+                except ValueError:
+                    malformed += 1
+                    continue
+                cards.append(parts[1])
+                dealer.append(parts[2])
+                choices.append(parts[4])
+                bets.append(bet)
+                changes.append(change)
+
+        if malformed:
+            logger.warning(f'Skipped {malformed} malformed lines in {self.path}')
+        return {'cards': np.array(cards, dtype=str), 'dealer': np.array(dealer, dtype=str),
+                'choices': np.array(choices, dtype=str), 'bet': np.array(bets, dtype=np.int64),
+                'change': np.array(changes, dtype=np.int64)}, malformed
+
+    def report(self, min_hands: int = 1) -> Tuple[List[CellReport], int]:
+        """
+        Compare the realized return per unit bet against the model's expected value for every decision cell.
+
+        Only the first choice played in each game is considered, as later decisions are already accounted for in its
+        expected value. Games without a known bet or a recorded choice, and malformed lines, are excluded.
+
+        :return: The cells sorted by how unlikely their difference is, and the number of games excluded. Cells the
+                 model has no expected value for (e.g. splitting a non-pair) have a NaN z and are sorted last.
+        """
+        data, malformed = self.load()
+        first = data['choices'].astype('<U1')
+        valid = (data['bet'] > 0) & (first != '')
+        first, bet, change = first[valid], data['bet'][valid], data['change'][valid]
+        realized = change / bet
+
+        # Classification and expected value only depend on the hand, so compute them once per distinct hand.
+        keys = np.char.add(np.char.add(np.char.add(data['cards'][valid], '|'), data['dealer'][valid]), '|')
+        unique, inverse = np.unique(np.char.add(keys, first), return_inverse=True)
+
+        cells, cell_index, expected = [], {}, np.empty(len(unique))
+        unique_cell = np.empty(len(unique), dtype=np.int64)
+        for i, key in enumerate(unique):
+            raw_cards, raw_dealer, letter = key.split('|')
+            cards, dealer = [Card(card) for card in raw_cards.split(',')], Card(raw_dealer)
+            classified = Blackjack.classify(cards, dealer)
+            cell = (TABLE_NAMES[classified[0]], classified[1], classified[2], letter) if classified \
+                else ('none', raw_cards, raw_dealer, letter)
+            if cell not in cell_index:
+                cell_index[cell] = len(cells)
+                cells.append(cell)
+            unique_cell[i] = cell_index[cell]
+            expected[i] = expected_value(cards, dealer, letter)
+
+        hand_cell = unique_cell[inverse]
+        hand_expected = expected[inverse]
+
+        counts = np.bincount(hand_cell, minlength=len(cells))
+        realized_mean = np.bincount(hand_cell, weights=realized, minlength=len(cells)) / counts
+        squares = np.bincount(hand_cell, weights=realized ** 2, minlength=len(cells)) / counts
+        expected_mean = np.bincount(hand_cell, weights=hand_expected, minlength=len(cells)) / counts
+
+        # A cell whose results never vary (e.g. every hand lost, or a parser reporting no change) is still an outlier,
+        # so the sample deviation is never allowed below what a hand's outcome naturally varies by.
+        floor = np.array([MIN_HAND_STD * (2 if cell[3] in 'DP' else 1) for cell in cells])
+        std = np.maximum(np.sqrt(np.maximum(squares - realized_mean ** 2, 0)), floor)
+        z = (realized_mean - expected_mean) / (std / np.sqrt(counts))
+
+        reports = [CellReport(*cells[i], int(counts[i]), float(realized_mean[i]), float(expected_mean[i]), float(z[i]))
+                   for i in range(len(cells)) if counts[i] >= min_hands]
+        excluded = int(np.count_nonzero(~valid)) + malformed
+        return sorted(reports, key=lambda r: (np.isnan(r.z), -abs(r.z))), excluded
@@ -108,3 +108,31 @@ class TaskResponse(EmbedMessage):
 
     def __repr__(self) -> str:
         return f'TaskResponse(change={self.change})'
+
+
+class BlackjackResult(EmbedMessage):
+    RESULT_REGEX = re.compile(r'Result: (Win|Loss|Push|Bust|Dealer bust|Blackjack)', re.IGNORECASE)
+    MONEY_REGEX = re.compile(r'\$([0-9,]+)')
+
+    __losses = ['loss', 'bust']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.result = re.search(BlackjackResult.RESULT_REGEX, self.embed.description).group(1).lower()
+        self.change = 0
+
+        money_match = re.search(BlackjackResult.MONEY_REGEX, self.embed.description)
+        if money_match and self.result != 'push':
+            change = int(money_match.group(1).replace(',', ''))
+            self.change = -change if self.result in BlackjackResult.__losses else change
+
+    @classmethod
+    def check_valid(cls, message: discord.Message) -> bool:
+        """Checks whether a Message object is a finished Blackjack game."""
+        return len(message.embeds) > 0 \
+               and message.embeds[0].description != discord.Embed.Empty \
+               and re.search(cls.RESULT_REGEX, message.embeds[0].description) is not None
+
+    def __repr__(self) -> str:
+        return f'BlackjackResult(result={self.result}, change={self.change})'
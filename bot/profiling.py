@@ -0,0 +1,146 @@
+"""
+profiling.py
+
+Holds the on-demand sampling profiler used to inspect the running client without restarting it.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional, List, Tuple
+
+from bot import constants
+
+logger = logging.getLogger(__file__)
+logger.setLevel(constants.LOGGING_LEVEL)
+
+
+def collapse_stack(frame) -> str:
+    """Converts a frame into a root-first, semicolon separated stack as used by flamegraph's collapsed format."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', code.co_name)
+        parts.append(f'{os.path.basename(code.co_filename)}:{name}')
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+
+class SamplingProfiler(object):
+    """
+    Samples the event loop's thread from a background thread for a fixed window of time.
+
+    Nothing runs while the profiler is inactive. While active, a heartbeat is scheduled on the event loop so that
+    callbacks which block the loop for longer than the stall threshold can be reported alongside their stacks.
+    """
+
+    def __init__(self, interval: float = constants.PROFILE_INTERVAL, stall_threshold: float = constants.STALL_THRESHOLD,
+                 directory: str = constants.PROFILE_DIR) -> None:
+        self.interval, self.stall_threshold, self.directory = interval, stall_threshold, directory
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = False
+        self._target: Optional[int] = None
+        self._started, self._last_beat = 0.0, 0.0
+
+        self.samples: Counter = Counter()
+        self.stalls: List[Tuple[float, float, Counter]] = []
+
+    @property
+    def active(self) -> bool:
+        """Returns True while a sampling window is in progress."""
+        return self._running
+
+    def start(self, duration: float = constants.PROFILE_DURATION) -> bool:
+        """
+        Begin a sampling window. Must be called from within the event loop's thread.
+        :param duration: The number of seconds to sample for.
+        :return: False if a window was already in progress.
+        """
+        if self.active:
+            logger.warning('Profiler is already running, ignoring request.')
+            return False
+
+        self.loop = asyncio.get_event_loop()
+        self._target = threading.get_ident()
+        self.samples, self.stalls = Counter(), []
+        self._running, self._started = True, time.perf_counter()
+
+        self._heartbeat()
+        threading.Thread(target=self._run, args=(duration, self._started, datetime.now()), name='SamplingProfiler',
+                         daemon=True).start()
+        logger.info(f'Profiling the event loop for {duration}s.')
+        return True
+
+    def _heartbeat(self) -> None:
+        """Marks the event loop as responsive, rescheduling itself until the window has ended."""
+        self._last_beat = time.perf_counter()
+        if self._running:
+            self.loop.call_later(self.interval, self._heartbeat)
+
+    def _run(self, duration: float, started: float, opened: datetime) -> None:
+        """Sampling thread body; collects stacks for the given duration and writes the results out."""
+        end = started + duration
+        stall: Optional[Tuple[float, Counter]] = None
+
+        while time.perf_counter() < end:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            stack = collapse_stack(frame)
+            del frame
+            self.samples[stack] += 1
+
+            # The heartbeat is scheduled every interval, so any further delay is time the loop spent blocked.
+            lag = time.perf_counter() - self._last_beat - self.interval
+            if lag > self.stall_threshold:
+                if stall is None:
+                    stall = (self._last_beat, Counter())
+                stall[1][stack] += 1
+            elif stall is not None:
+                self.stalls.append((stall[0], self._last_beat - stall[0], stall[1]))
+                stall = None
+
+        if stall is not None:
+            self.stalls.append((stall[0], time.perf_counter() - stall[0], stall[1]))
+
+        # Keep this window's results, as a new window may start and replace them while they are being written.
+        samples, stalls = self.samples, self.stalls
+        self._running = False
+
+        try:
+            self.write(samples, stalls, started, opened)
+        except OSError:
+            logger.exception('Failed to write profiling results.')
+
+    def write(self, samples: Counter, stalls: List[Tuple[float, float, Counter]], started: float,
+              opened: datetime) -> str:
+        """
+        Write a window's collapsed stacks and slow callback report to the profile directory.
+        :param started: The window's start, as a perf_counter value.
+        :param opened: The window's start, used to name the files.
+        :return: The path of the collapsed stack file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f'profile-{opened.strftime("%Y%m%d-%H%M%S-%f")}')
+
+        with open(base + '.folded', 'w', encoding='utf-8') as file:
+            for stack, count in samples.most_common():
+                file.write(f'{stack} {count}\n')
+
+        with open(base + '.stalls.txt', 'w', encoding='utf-8') as file:
+            file.write(f'{len(stalls)} event loop stalls over {self.stall_threshold}s\n')
+            for stall_start, length, stacks in sorted(stalls, key=lambda s: s[1], reverse=True):
+                file.write(f'\nStalled for {round(length, 3)}s ({round(stall_start - started, 2)}s into window)\n')
+                for stack, count in stacks.most_common(3):
+                    file.write(f'  {count}x {stack}\n')
+
+        logger.info(f'Profiling finished with {sum(samples.values())} samples and {len(stalls)} stalls, '
+                    f'written to {base}.folded')
+        return base + '.folded'